@@ -0,0 +1,33 @@
+"""Gunicorn settings for serving zoho_ticket_api:app in production."""
+import os
+import threading
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+
+# Handlers spend nearly all their time waiting on Zoho. gevent workers make that
+# socket I/O cooperative, so each worker keeps many round-trips in flight at once.
+worker_class = "gevent"
+workers = int(os.getenv("GUNICORN_WORKERS", "2"))
+worker_connections = 1000
+
+# Keep client connections open across requests, e.g. behind a load balancer.
+keepalive = 75
+
+# Each worker builds its own HTTP session and token after fork; preloading would
+# hand every worker copies of the same pooled sockets.
+preload_app = False
+
+
+def _warm_token():
+    from zoho_ticket_api import ensure_valid_token, logger
+
+    if not ensure_valid_token():
+        logger.critical("CRITICAL: Could not obtain initial Zoho token.")
+
+
+def post_worker_init(worker):
+    """Starts fetching a Zoho token as each worker boots so the first request doesn't pay for it."""
+    # A refresh with retries can outlast Gunicorn's worker timeout, so it must not block the
+    # run loop (and its heartbeat). Under gevent this thread is a greenlet; requests arriving
+    # meanwhile join the same single-flight refresh.
+    threading.Thread(target=_warm_token, name="zoho-token-warmup", daemon=True).start()
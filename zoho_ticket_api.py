@@ -1,10 +1,21 @@
 import os
-import requests
+import re
+import hashlib
 import json
+import requests
+import orjson
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
+import logging.handlers
+import queue
+import atexit
 import threading
-from flask import Flask, request, jsonify
-from datetime import datetime, timedelta
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote_from_bytes
+from flask import Flask, Response, request
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -12,18 +23,29 @@ load_dotenv()
 
 # --- Restored Production-Grade Logging Setup ---
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
+_log_level_name = os.getenv("LOG_LEVEL", "INFO").upper()
+_log_level = logging.getLevelName(_log_level_name)
+logger.setLevel(_log_level if isinstance(_log_level, int) else logging.INFO)
 log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
 # Log to a file
 file_handler = logging.FileHandler('zoho_api.log', mode='a', encoding='utf-8')
 file_handler.setFormatter(log_formatter)
-logger.addHandler(file_handler)
 
 # Log to the console
 stream_handler = logging.StreamHandler()
 stream_handler.setFormatter(log_formatter)
-logger.addHandler(stream_handler)
+
+# The calling thread still interpolates the message and renders any traceback
+# (QueueHandler.prepare); the background listener does the final formatting and the I/O.
+_log_queue = queue.SimpleQueue()
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+_log_listener = logging.handlers.QueueListener(_log_queue, file_handler, stream_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+if not isinstance(_log_level, int):
+    logger.warning("Unknown LOG_LEVEL %r; falling back to INFO.", _log_level_name)
 
 # --- Configuration ---
 ZOHO_CONFIG = {
@@ -34,145 +56,472 @@ ZOHO_CONFIG = {
     "API_BASE_URL": os.getenv("ZOHO_API_BASE_URL")
 }
 
+# Endpoint URLs, static headers and the refresh payload are fixed at import, so build them once here.
+_TOKEN_URL = f"{ZOHO_CONFIG['ACCOUNTS_URL']}/oauth/v2/token"
+_REFRESH_PAYLOAD = {
+    "grant_type": "refresh_token",
+    "client_id": ZOHO_CONFIG["CLIENT_ID"],
+    "client_secret": ZOHO_CONFIG["CLIENT_SECRET"],
+    "refresh_token": ZOHO_CONFIG["REFRESH_TOKEN"],
+}
+_CREATE_URL = f"{ZOHO_CONFIG['API_BASE_URL']}/api/v3/requests"
+_GET_URL = _CREATE_URL + "/"
+_READ_HEADERS = {"Accept": "application/vnd.manageengine.sdp.v3+json"}
+_WRITE_HEADERS = {**_READ_HEADERS, "Content-Type": "application/x-www-form-urlencoded"}
+
+# Fields every ticket needs regardless of Zoho template (see README).
+_REQUIRED_FIELDS = ("subject", "description", "requester_email")
+# Compiled once; rejects missing local part/domain, whitespace, repeated '@' and dot-less domains.
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+# --- Shared HTTP Session ---
+# A single pooled session keeps TCP/TLS connections to Zoho alive across calls.
+# Transient failures are retried with jittered exponential backoff. Ticket
+# creation is not idempotent, so POSTs are only retried on the token endpoint.
+_RETRY_STATUSES = [429, 500, 502, 503, 504]
+_RETRY_TOTAL = 3
+# Zoho's Retry-After is honoured only up to this many seconds; urllib3's own default is 6h.
+_RETRY_AFTER_MAX = 5
+
+def _build_retry(allowed_methods):
+    return Retry(
+        total=_RETRY_TOTAL,
+        backoff_factor=0.5,
+        backoff_jitter=0.5,
+        status_forcelist=_RETRY_STATUSES,
+        allowed_methods=allowed_methods,
+        respect_retry_after_header=True,
+        retry_after_max=_RETRY_AFTER_MAX,
+        raise_on_status=False,  # Hand the final response back so raise_for_status() reports it.
+    )
+
+# (connect, read): fail fast on an unreachable host so a retry can move on, but allow
+# Zoho the full 30s to answer once connected.
+_TIMEOUT = (5, 30)
+# Longest a token refresh can take: every attempt using its full connect+read timeout,
+# plus a capped Retry-After sleep between attempts (the jittered backoff stays below it).
+_REFRESH_WORST_CASE = (_RETRY_TOTAL + 1) * sum(_TIMEOUT) + _RETRY_TOTAL * _RETRY_AFTER_MAX  # seconds
+
+class _ZohoAuthAdapter(HTTPAdapter):
+    """Refreshes the access token and resends once when Zoho rejects it with a 401."""
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        if response.status_code != 401:
+            return response
+        # Drain and release the 401 before refreshing so its connection is back in the
+        # pool while the token call runs; the cached body still serves a failed refresh.
+        _ = response.content  # drain
+        response.close()
+        if not _refresh_rejected_token(request.headers.get("Authorization")):
+            return response
+        request.headers["Authorization"] = token_store["read_headers"]["Authorization"]
+        return super().send(request, **kwargs)
+
+_session = requests.Session()
+_session.headers.update({"User-Agent": "zoho-ticket-api"})
+
+# Callers beyond ZOHO_POOL_MAXSIZE wait for a pooled connection instead of opening
+# (and then discarding) an extra one that pays its own TLS handshake.
+# The API base URL comes from the environment and may be plain http in development.
+ZOHO_POOL_MAXSIZE = int(os.getenv("ZOHO_POOL_MAXSIZE", "50"))
+_api_adapter = _ZohoAuthAdapter(
+    pool_connections=20,
+    pool_maxsize=ZOHO_POOL_MAXSIZE,
+    pool_block=True,
+    max_retries=_build_retry(["GET"]),
+)
+_session.mount("https://", _api_adapter)
+_session.mount("http://", _api_adapter)
+_session.mount(ZOHO_CONFIG["ACCOUNTS_URL"], HTTPAdapter(max_retries=_build_retry(["POST"])))
+
+_LOG_BODY_LIMIT = 2048
+# OAuth secrets that must never reach the logs, whichever response they turn up in. A value
+# cut off by the preview limit has no closing quote, so the end of the buffer also ends it.
+_SECRET_FIELD_RE = re.compile(rb'("(?:access_token|refresh_token)"\s*:\s*")[^"]*(?:"|\Z)')
+
+def _body_preview(response):
+    """Returns the start of a Zoho response body for logging, decoded as UTF-8 without charset sniffing."""
+    preview = _SECRET_FIELD_RE.sub(rb'\1[REDACTED]"', response.content[:_LOG_BODY_LIMIT])
+    return preview.decode("utf-8", "replace")
+
+def _fast_json(response):
+    """Decodes a Zoho response body with orjson; Zoho always sends UTF-8, so charset sniffing is skipped."""
+    body = response.content
+    if logger.isEnabledFor(logging.DEBUG):
+        if response.url.startswith(_TOKEN_URL):
+            # The token reply carries the live access token; never write its body to the logs.
+            logger.debug("Zoho response %s from %s", response.status_code, _TOKEN_URL)
+        else:
+            logger.debug("Zoho response %s from %s: %s", response.status_code, response.url, _body_preview(response))
+    return orjson.loads(body)
+
 # --- Thread-Safe Token Management ---
-token_store = {"access_token": None, "expires_at": None}
+# expires_at is a time.monotonic() deadline, so validity checks are a single float compare.
+# The Zoho request headers are built once per refresh rather than on every call.
+token_store = {"access_token": None, "expires_at": 0.0, "read_headers": None, "write_headers": None}
 _token_lock = threading.Lock()
+# Set while a refresh is in flight; concurrent callers wait on it instead of refreshing again.
+_refresh_event = None
+
+def _set_token(access_token, valid_for):
+    """Stores a token with its prebuilt request headers, valid for the given number of seconds."""
+    authorization = f"Zoho-oauthtoken {access_token}"
+    token_store["read_headers"] = {**_READ_HEADERS, "Authorization": authorization}
+    token_store["write_headers"] = {**_WRITE_HEADERS, "Authorization": authorization}
+    token_store["access_token"] = access_token
+    token_store["expires_at"] = time.monotonic() + valid_for
 
 def get_access_token():
     """Fetches a new access token from Zoho using the refresh token."""
     logger.info("Attempting to refresh Zoho access token...")
-    url = f"{ZOHO_CONFIG['ACCOUNTS_URL']}/oauth/v2/token"
-    payload = {
-        "grant_type": "refresh_token",
-        "client_id": ZOHO_CONFIG["CLIENT_ID"],
-        "client_secret": ZOHO_CONFIG["CLIENT_SECRET"],
-        "refresh_token": ZOHO_CONFIG["REFRESH_TOKEN"],
-    }
     try:
-        response = requests.post(url, data=payload, timeout=30)
+        response = _session.post(_TOKEN_URL, data=_REFRESH_PAYLOAD, timeout=_TIMEOUT)
         response.raise_for_status()
-        data = response.json()
+        data = _fast_json(response)
         if "access_token" in data:
             expires_in = data.get("expires_in", 3600)
-            token_store["access_token"] = data["access_token"]
-            token_store["expires_at"] = datetime.now() + timedelta(seconds=expires_in - 300)
+            _set_token(data["access_token"], expires_in - 300)
             logger.info("✅ Successfully refreshed Zoho access token.")
             return True
         else:
-            logger.error(f"❌ Zoho API did not return an access token. Response: {data}")
+            logger.error("❌ Zoho API did not return an access token. Response: %s", data)
             return False
-    except requests.exceptions.RequestException as e:
-        logger.error(f"❌ Exception during token refresh: {e}")
+    except (requests.exceptions.RequestException, ValueError) as e:
+        # ValueError covers orjson.JSONDecodeError, e.g. an HTML page from a proxy in front of Zoho.
+        logger.error("❌ Exception during token refresh: %s", e)
         return False
 
 def is_token_valid():
     """Checks if the current token exists and has not expired."""
-    return token_store.get("access_token") and token_store.get("expires_at") and datetime.now() < token_store["expires_at"]
+    return time.monotonic() < token_store["expires_at"]
 
 def ensure_valid_token():
-    """Ensures a valid access token is available using a thread-safe lock."""
+    """Ensures a valid access token is available, with at most one refresh in flight."""
+    global _refresh_event
     if is_token_valid():
         return True
     with _token_lock:
         # Double-check after acquiring the lock, in case another thread just refreshed it.
         if is_token_valid():
             return True
+        refresh_event = _refresh_event
+        is_refresher = refresh_event is None
+        if is_refresher:
+            refresh_event = _refresh_event = threading.Event()
+
+    if not is_refresher:
+        # Another thread is already talking to Zoho; share its result.
+        refresh_event.wait()
+        return is_token_valid()
+
+    try:
+        return _obtain_token()
+    finally:
+        with _token_lock:
+            _refresh_event = None
+        refresh_event.set()
+
+def _refresh_rejected_token(rejected_authorization):
+    """Expires the token Zoho just rejected (unless already replaced) and ensures a new one."""
+    with _token_lock:
+        current_headers = token_store["read_headers"]
+        rejected_current = bool(current_headers) and current_headers["Authorization"] == rejected_authorization
+        if rejected_current:
+            token_store["expires_at"] = 0.0
+    if rejected_current and _redis is not None:
+        _discard_shared_token(rejected_authorization)
+    return ensure_valid_token()
+
+# --- Shared Token Cache (optional) ---
+# Every Gunicorn worker would otherwise refresh its own token. With TOKEN_CACHE_TYPE=redis
+# one worker refreshes (guarded by a Redis lock) and the others adopt its token, which
+# keeps the same 300s safety buffer via its wall-clock expiry. The lock outlives the slowest
+# possible refresh so it cannot lapse while held; waiters wait at most that long, and take
+# the lock over if its holder releases it without publishing a token.
+TOKEN_CACHE_TYPE = os.getenv("TOKEN_CACHE_TYPE", "memory").lower()
+_SHARED_TOKEN_KEY = "zoho:access_token"
+_SHARED_LOCK_KEY = "zoho:access_token:lock"
+_SHARED_LOCK_TTL = _REFRESH_WORST_CASE
+
+_redis = None
+if TOKEN_CACHE_TYPE == "redis":
+    import redis  # Optional dependency, only needed for the shared token cache.
+    _redis = redis.Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+
+def _load_shared_token():
+    """Adopts the token another worker published, if it has not expired."""
+    raw = _redis.get(_SHARED_TOKEN_KEY)
+    if raw is None:
+        return False
+    try:
+        shared = orjson.loads(raw)
+        token, valid_for = shared["token"], shared["expires_at"] - time.time()
+    except (ValueError, KeyError, TypeError):
+        logger.warning("Discarding malformed token in shared cache.")
+        _redis.delete(_SHARED_TOKEN_KEY)
+        return False
+    if valid_for <= 0:
+        return False
+    _set_token(token, valid_for)
+    return True
+
+def _publish_shared_token():
+    """Publishes this worker's token for the others, expiring alongside it."""
+    valid_for = token_store["expires_at"] - time.monotonic()
+    if valid_for > 0:
+        value = orjson.dumps({"token": token_store["access_token"], "expires_at": time.time() + valid_for})
+        _redis.set(_SHARED_TOKEN_KEY, value, px=int(valid_for * 1000))
+
+def _wait_for_shared_token(lock):
+    """Polls while another worker holds the refresh lock; returns (adopted, holds_lock).
+
+    Stops early if the holder lets go of the lock without publishing a token (its refresh
+    failed), taking the lock over so this worker refreshes instead.
+    """
+    deadline = time.monotonic() + _SHARED_LOCK_TTL
+    while time.monotonic() < deadline:
+        time.sleep(0.1)
+        if _load_shared_token():
+            return True, False
+        if lock.acquire(blocking=False):
+            return False, True
+    return False, False
+
+def _discard_shared_token(rejected_authorization):
+    """Removes the shared token if it is the one Zoho just rejected."""
+    try:
+        raw = _redis.get(_SHARED_TOKEN_KEY)
+        if raw is not None and f"Zoho-oauthtoken {orjson.loads(raw)['token']}" == rejected_authorization:
+            _redis.delete(_SHARED_TOKEN_KEY)
+    except (redis.RedisError, ValueError, KeyError, TypeError) as e:
+        logger.warning("Could not discard rejected token from shared cache: %s", e)
+
+def _obtain_token():
+    """Gets a fresh token from the shared cache when enabled, otherwise (or on a miss) from Zoho."""
+    if _redis is None:
+        return get_access_token()
+
+    # redis-py's Lock stores a unique token and releases with compare-and-delete, so a
+    # holder can never remove a lock that has since passed to another worker.
+    lock = _redis.lock(_SHARED_LOCK_KEY, timeout=_SHARED_LOCK_TTL)
+    holds_lock = False
+    try:
+        if _load_shared_token():
+            return True
+        holds_lock = lock.acquire(blocking=False)
+        if not holds_lock:
+            adopted, holds_lock = _wait_for_shared_token(lock)
+            if adopted:
+                return True
+    except redis.RedisError as e:
+        logger.warning("Shared token cache unavailable, refreshing locally: %s", e)
         return get_access_token()
 
-# --- Helper Function to Parse Ticket Details ---
+    refreshed = get_access_token()
+    try:
+        if refreshed:
+            _publish_shared_token()
+    except redis.RedisError as e:
+        logger.warning("Could not update shared token cache: %s", e)
+    if holds_lock:
+        try:
+            lock.release()
+        except redis.RedisError as e:
+            logger.warning("Could not release shared token refresh lock: %s", e)
+    return refreshed
+
+# --- Helper Functions for Zoho Payloads ---
+def _build_request_body(client_data):
+    """Encodes the client's ticket fields as Zoho's urlencoded input_data form body, mapping requester_email."""
+    zoho_data = {key: value for key, value in client_data.items() if key != 'requester_email'}
+    zoho_data['requester'] = {'email_id': client_data['requester_email']}
+    # One orjson pass straight to UTF-8 bytes, then one percent-encoding pass. orjson rejects
+    # integers wider than 64 bits, which stdlib json still forwards to Zoho as before.
+    try:
+        encoded = orjson.dumps({"request": zoho_data})
+    except orjson.JSONEncodeError:
+        encoded = json.dumps({"request": zoho_data}, ensure_ascii=False, separators=(",", ":")).encode()
+    return b"input_data=" + quote_from_bytes(encoded, safe="").encode()
+
 def _parse_ticket_details(zoho_response):
     """Parses the full Zoho ticket JSON and returns a simplified dictionary."""
-    request_data = zoho_response.get("request", {})
-    
-    status_info = request_data.get("status", {})
+    # Read only the five leaf values we expose; a null ticket or sub-object counts as missing.
+    request_data = zoho_response.get("request") or {}
     technician_info = request_data.get("technician")
-    resolution_info = request_data.get("resolution")
-
-    simplified_ticket = {
+    return {
         "ticket_id": request_data.get("id"),
-        "status": status_info.get("name") if status_info else None,
+        "status": (request_data.get("status") or {}).get("name"),
         "technician_assigned": technician_info.get("name") if technician_info else "Unassigned",
         "technician_contact_email": technician_info.get("email_id") if technician_info else None,
-        "technician_comments": resolution_info.get("content") if resolution_info else None
+        "technician_comments": (request_data.get("resolution") or {}).get("content")
     }
+
+# --- Ticket Fetching ---
+# Batch lookups fan out on a shared pool; its size caps concurrent Zoho calls per process.
+BATCH_MAX_IDS = 100
+_batch_executor = ThreadPoolExecutor(max_workers=20, thread_name_prefix="zoho-batch")
+
+# Polling clients re-read the same ticket often; serve repeats within the TTL from memory.
+TICKET_CACHE_TTL = float(os.getenv("TICKET_CACHE_TTL", "5"))
+_ticket_cache = TTLCache(maxsize=10_000, ttl=TICKET_CACHE_TTL)
+_ticket_cache_lock = threading.Lock()
+
+def _fetch_ticket(request_id):
+    """Fetches a single ticket from Zoho (or the short-lived cache) and returns its simplified details."""
+    with _ticket_cache_lock:
+        cached_ticket = _ticket_cache.get(request_id)
+    if cached_ticket is not None:
+        return cached_ticket
+
+    response = _session.get(_GET_URL + request_id, headers=token_store["read_headers"], timeout=_TIMEOUT)
+    response.raise_for_status()
+    simplified_ticket = _parse_ticket_details(_fast_json(response))
+    with _ticket_cache_lock:
+        _ticket_cache[request_id] = simplified_ticket
     return simplified_ticket
 
+# --- Duplicate Submission Handling ---
+# Clients on flaky networks often resend the same ticket. Identical bodies seen within the
+# TTL get the original ticket ID back, and concurrent duplicates share one Zoho call.
+IDEMPOTENCY_TTL = float(os.getenv("IDEMPOTENCY_TTL", "120"))
+_idempotency_cache = TTLCache(maxsize=2048, ttl=IDEMPOTENCY_TTL)
+_idempotency_in_flight = {}
+_idempotency_lock = threading.Lock()
+
+def _idempotency_key(client_data):
+    """Hashes the client's ticket body independently of key order."""
+    # stdlib json, unlike orjson, accepts every value get_json() can produce (e.g. >64-bit ints).
+    canonical = json.dumps(client_data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+def _claim_submission(key):
+    """Returns (ticket_id, None) for a recent duplicate, or (None, event) once the caller owns the submission."""
+    while True:
+        with _idempotency_lock:
+            ticket_id = _idempotency_cache.get(key)
+            if ticket_id is not None:
+                return ticket_id, None
+            in_flight = _idempotency_in_flight.get(key)
+            if in_flight is None:
+                in_flight = _idempotency_in_flight[key] = threading.Event()
+                return None, in_flight
+        # An identical ticket is being sent to Zoho right now; wait for it, then re-check.
+        in_flight.wait()
+
+def _release_submission(key, in_flight, ticket_id):
+    """Records the created ticket ID (if any) and wakes callers waiting on the same submission."""
+    with _idempotency_lock:
+        if ticket_id is not None:
+            _idempotency_cache[key] = ticket_id
+        del _idempotency_in_flight[key]
+    in_flight.set()
+
 # --- Flask Application ---
 app = Flask(__name__)
 
+def _json_response(obj, status=200):
+    """Serializes obj with orjson straight into a Response, skipping jsonify's provider dispatch."""
+    return Response(orjson.dumps(obj), status=status, mimetype="application/json")
+
 @app.route("/", methods=['GET'])
 def health_check():
     """Health check endpoint to verify service status."""
-    return jsonify({"status": "running", "service": "Zoho Ticket API", "token_valid": is_token_valid()})
+    return _json_response({"status": "running", "service": "Zoho Ticket API", "token_valid": is_token_valid()})
 
 @app.route("/requests/<string:request_id>", methods=['GET'])
 def get_ticket(request_id):
     """Fetches and returns simplified details for a single ticket."""
-    logger.info(f"Received GET request for ticket ID: {request_id}")
+    logger.info("Received GET request for ticket ID: %s", request_id)
     if not ensure_valid_token():
-        return jsonify({"error": "API authentication failed"}), 503
+        return _json_response({"error": "API authentication failed"}, 503)
 
-    api_url = f"{ZOHO_CONFIG['API_BASE_URL']}/api/v3/requests/{request_id}"
-    headers = {
-        "Authorization": f"Zoho-oauthtoken {token_store['access_token']}",
-        "Accept": "application/vnd.manageengine.sdp.v3+json"
-    }
     try:
-        response = requests.get(api_url, headers=headers, timeout=30)
-        response.raise_for_status()
-        
-        full_ticket_data = response.json()
-        simplified_ticket = _parse_ticket_details(full_ticket_data)
-        
-        logger.info(f"Successfully fetched and parsed ticket ID: {request_id}")
-        return jsonify(simplified_ticket), 200
+        simplified_ticket = _fetch_ticket(request_id)
+        logger.info("Successfully fetched and parsed ticket ID: %s", request_id)
+        return _json_response(simplified_ticket)
         
     except requests.exceptions.HTTPError as e:
-        logger.error(f"HTTP Error fetching ticket {request_id}: {e.response.text}")
-        return jsonify({"error": "Failed to fetch ticket", "details": e.response.json()}), e.response.status_code
+        logger.error("HTTP Error fetching ticket %s: %s", request_id, _body_preview(e.response))
+        return _json_response({"error": "Failed to fetch ticket", "details": _fast_json(e.response)}, e.response.status_code)
     except Exception as e:
-        logger.error(f"Unexpected error getting ticket {request_id}: {e}", exc_info=True)
-        return jsonify({"error": "An internal server error occurred."}), 500
+        logger.error("Unexpected error getting ticket %s: %s", request_id, e, exc_info=True)
+        return _json_response({"error": "An internal server error occurred."}, 500)
+
+@app.route("/requests/batch", methods=['POST'])
+def get_tickets_batch():
+    """Fetches simplified details for several tickets concurrently."""
+    logger.info("Received POST request for a batch of tickets.")
+    if not ensure_valid_token():
+        return _json_response({"error": "API authentication failed"}, 503)
+
+    client_data = request.get_json()
+    ids = client_data.get("ids") if isinstance(client_data, dict) else None
+    if not isinstance(ids, list) or not ids:
+        return _json_response({"error": "Request body must include a non-empty 'ids' list"}, 400)
+    if len(ids) > BATCH_MAX_IDS:
+        return _json_response({"error": f"A batch may contain at most {BATCH_MAX_IDS} ids"}, 400)
+    if not all(isinstance(i, (str, int)) and str(i).isascii() and str(i).isdigit() for i in ids):
+        return _json_response({"error": "Ticket ids must be numeric"}, 400)
+
+    futures = {str(i): _batch_executor.submit(_fetch_ticket, str(i)) for i in ids}
+
+    tickets, errors = [], []
+    for request_id, future in futures.items():
+        try:
+            tickets.append(future.result())
+        except requests.exceptions.HTTPError as e:
+            logger.error("HTTP Error fetching ticket %s: %s", request_id, _body_preview(e.response))
+            errors.append({"ticket_id": request_id, "error": "Failed to fetch ticket", "status_code": e.response.status_code})
+        except Exception as e:
+            logger.error("Unexpected error getting ticket %s: %s", request_id, e, exc_info=True)
+            errors.append({"ticket_id": request_id, "error": "An internal server error occurred."})
+
+    logger.info("Fetched %d of %d tickets in batch.", len(tickets), len(futures))
+    return _json_response({"tickets": tickets, "errors": errors})
 
 @app.route("/requests", methods=['POST'])
 def create_ticket():
     """Creates a new ticket, handling data transformation for the client."""
     logger.info("Received POST request to create a new ticket.")
     if not ensure_valid_token():
-        return jsonify({"error": "API authentication failed."}), 503
+        return _json_response({"error": "API authentication failed."}, 503)
         
     client_data = request.get_json()
-    if not client_data:
-        return jsonify({"error": "Invalid or empty JSON body provided"}), 400
-
-    zoho_data = client_data.copy()
-    if 'requester_email' in zoho_data:
-        email = zoho_data.pop('requester_email')
-        zoho_data['requester'] = {'email_id': email}
-
-    zoho_request_wrapper = {"request": zoho_data}
-    payload = {'input_data': json.dumps(zoho_request_wrapper)}
-
-    api_url = f"{ZOHO_CONFIG['API_BASE_URL']}/api/v3/requests"
-    headers = {
-        "Authorization": f"Zoho-oauthtoken {token_store['access_token']}",
-        "Content-Type": "application/x-www-form-urlencoded",
-        "Accept": "application/vnd.manageengine.sdp.v3+json"
-    }
+    if not client_data or not isinstance(client_data, dict):
+        return _json_response({"error": "Invalid or empty JSON body provided"}, 400)
+
+    missing_fields = [field for field in _REQUIRED_FIELDS if not client_data.get(field)]
+    if missing_fields:
+        return _json_response({"error": f"Missing required fields: {', '.join(missing_fields)}"}, 400)
+
+    email = client_data['requester_email']
+    if not (isinstance(email, str) and _EMAIL_RE.match(email)):
+        return _json_response({"error": "Invalid email format"}, 400)
+
+    submission_key = _idempotency_key(client_data)
+    ticket_id, in_flight = _claim_submission(submission_key)
+    if in_flight is None:
+        logger.info("Duplicate submission; returning existing ticket ID: %s", ticket_id)
+        return _json_response({"message": "Ticket created successfully", "zoho_ticket_id": ticket_id}, 201)
 
     try:
-        response = requests.post(api_url, headers=headers, data=payload, timeout=30)
+        payload = _build_request_body(client_data)
+        response = _session.post(_CREATE_URL, headers=token_store["write_headers"], data=payload, timeout=_TIMEOUT)
         response.raise_for_status()
-        response_data = response.json()
-        ticket_id = response_data.get("request", {}).get("id")
-        logger.info(f"✅ Ticket created successfully - ID: {ticket_id}")
-        return jsonify({"message": "Ticket created successfully", "zoho_ticket_id": ticket_id}), 201
+        response_data = _fast_json(response)
+        # Zoho answers with a single "request" object, or a "requests" list for bulk-style replies.
+        ticket_id = (response_data.get("request") or (response_data.get("requests") or [{}])[0]).get("id")
+        logger.info("✅ Ticket created successfully - ID: %s", ticket_id)
+        return _json_response({"message": "Ticket created successfully", "zoho_ticket_id": ticket_id}, 201)
     except requests.exceptions.HTTPError as e:
-        logger.error(f"API request failed: {e.response.text}")
-        return jsonify({"error": "Failed to create ticket", "details": e.response.json()}), e.response.status_code
+        logger.error("API request failed: %s", _body_preview(e.response))
+        return _json_response({"error": "Failed to create ticket", "details": _fast_json(e.response)}, e.response.status_code)
     except Exception as e:
-        logger.error(f"An unexpected error occurred: {e}", exc_info=True)
-        return jsonify({"error": "An internal server error occurred"}), 500
+        logger.error("An unexpected error occurred: %s", e, exc_info=True)
+        return _json_response({"error": "An internal server error occurred"}, 500)
+    finally:
+        _release_submission(submission_key, in_flight, ticket_id)
 
 if __name__ == '__main__':
     with app.app_context():